@@ -8,6 +8,7 @@ import os
 import warnings
 
 os.environ["HYDRA_FULL_ERROR"] = "1"
+os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
 warnings.filterwarnings("ignore")
 
 import hydra
@@ -11,14 +11,20 @@ os.environ["HYDRA_FULL_ERROR"] = "1"
 warnings.filterwarnings("ignore")
 
 import pandas as pd
-import numpy as np
 
-import io
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
 import requests
 from tqdm import tqdm
 
-from bs4 import BeautifulSoup
-from pypdf import PdfReader
+import fitz
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+    from bs4 import BeautifulSoup
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
@@ -30,9 +36,18 @@ from src.databases import FaissIndex
 from src.models import VllmEmbedding
 
 
+_thread_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    if not hasattr(_thread_local, "session"):
+        _thread_local.session = requests.Session()
+    return _thread_local.session
+
+
 def get_text_from_url(url: str):
     try:
-        response = requests.get(
+        response = get_session().get(
             url,
             timeout=20,
             headers={"User-Agent": "Mozilla/5.0"},
@@ -40,15 +55,24 @@ def get_text_from_url(url: str):
         response.raise_for_status()
 
         if url.endswith(".pdf"):
-            pdf_file = io.BytesIO(response.content)
-            reader = PdfReader(pdf_file)
-            text = "".join(
-                page.extract_text() for page in reader.pages if page.extract_text()
+            with fitz.open(
+                stream=response.content,
+                filetype="pdf",
+            ) as doc:
+                text = "\n".join(page.get_text("text") for page in doc)
+        elif HTMLParser is not None:
+            tree = HTMLParser(response.content)
+            text = " ".join(
+                node.text(
+                    deep=True,
+                    strip=False,
+                )
+                for node in tree.css("p")
             )
         else:
             soup = BeautifulSoup(
                 response.content,
-                "html.parser",
+                "lxml",
                 from_encoding="utf-8",
             )
             text = " ".join(p.get_text() for p in soup.find_all("p"))
@@ -68,18 +92,24 @@ def set_vector_store(
     index: FaissIndex = instantiate(
         config.database,
     )
-    embedding: VllmEmbedding = instantiate(
-        config.model.embedding,
-    )
 
     documents_path = os.path.join(
         config.data_path,
         config.documents_name,
     )
-    docs_df = pd.read_csv(documents_path)
-
-    tqdm.pandas(desc="Fetching text from URLs")
-    docs_df["text"] = docs_df["url"].progress_apply(get_text_from_url)
+    docs_df = pd.read_parquet(documents_path)
+
+    urls = docs_df["url"].tolist()
+    texts = [None] * len(urls)
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        futures = {
+            executor.submit(get_text_from_url, url): i for i, url in enumerate(urls)
+        }
+        for future in tqdm(
+            as_completed(futures), total=len(futures), desc="Fetching text from URLs"
+        ):
+            texts[futures[future]] = future.result()
+    docs_df["text"] = texts
     docs_df.dropna(subset=["text"], inplace=True)
     docs_df = docs_df[docs_df["text"] != ""]
 
@@ -88,31 +118,51 @@ def set_vector_store(
         chunk_overlap=100,
     )
 
-    chunks = []
-    for _, row in tqdm(
-        docs_df.iterrows(), total=docs_df.shape[0], desc="Splitting text"
-    ):
-        for chunk_text in text_splitter.split_text(row["text"]):
-            chunks.append(
-                {
-                    "domain": row["domain"],
-                    "file_name": row["file_name"],
-                    "url": row["url"],
-                    "chunk": chunk_text,
-                }
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        splitted_texts = list(
+            tqdm(
+                executor.map(
+                    text_splitter.split_text,
+                    docs_df["text"].tolist(),
+                    chunksize=16,
+                ),
+                total=docs_df.shape[0],
+                desc="Splitting text",
             )
+        )
 
-    chunks_df = pd.DataFrame(chunks)
+    chunk_domains = []
+    chunk_file_names = []
+    chunk_urls = []
+    chunk_texts = []
+    for domain, file_name, url, doc_chunk_texts in zip(
+        docs_df["domain"].tolist(),
+        docs_df["file_name"].tolist(),
+        docs_df["url"].tolist(),
+        splitted_texts,
+    ):
+        num_chunks = len(doc_chunk_texts)
+        chunk_domains.extend([domain] * num_chunks)
+        chunk_file_names.extend([file_name] * num_chunks)
+        chunk_urls.extend([url] * num_chunks)
+        chunk_texts.extend(doc_chunk_texts)
+
+    chunks_df = pd.DataFrame(
+        {
+            "domain": chunk_domains,
+            "file_name": chunk_file_names,
+            "url": chunk_urls,
+            "chunk": chunk_texts,
+        }
+    )
 
-    queries = chunks_df["chunk"].tolist()
-    embedded = [
-        embedding(query=query) for query in tqdm(queries, desc="Generating embeddings")
-    ]
-    embedded = np.array(
-        embedded,
-        dtype=np.float32,
+    embedding: VllmEmbedding = instantiate(
+        config.model.embedding,
     )
 
+    queries = chunks_df["chunk"].tolist()
+    embedded = embedding.embed_many(queries=queries)
+
     index.add(embedded=embedded)
     index.df = chunks_df
     index.save()
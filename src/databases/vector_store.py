@@ -1,4 +1,4 @@
-from typing import Dict, List, Any
+from typing import List, Optional
 import os
 
 import numpy as np
@@ -16,6 +16,10 @@ class FaissIndex:
         dim: int,
         retrieval_top_k: int,
         distance_column_name: str,
+        hnsw_m: int,
+        ef_construction: int,
+        ef_search: int,
+        quantizer_type: Optional[str],
     ) -> None:
         self.data_path = data_path
         self.indices_name = indices_name
@@ -30,10 +34,25 @@ class FaissIndex:
         )
 
         self.dim = dim
-        self.index = faiss.IndexFlatIP(dim)
+        self.ef_search = ef_search
+        if quantizer_type is None:
+            self.index = faiss.IndexHNSWFlat(
+                dim,
+                hnsw_m,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+        else:
+            self.index = faiss.IndexHNSWSQ(
+                dim,
+                getattr(faiss.ScalarQuantizer, f"QT_{quantizer_type}"),
+                hnsw_m,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+        self.index.hnsw.efConstruction = ef_construction
+        self.index.hnsw.efSearch = self.ef_search
 
         if os.path.exists(self.items_path):
-            self.df = pd.read_csv(self.items_path)
+            self.df = pd.read_parquet(self.items_path)
         else:
             self.df = pd.DataFrame()
 
@@ -44,12 +63,14 @@ class FaissIndex:
         self,
         embedded: np.ndarray,
     ) -> None:
+        if not self.index.is_trained:
+            self.index.train(embedded)
         self.index.add(embedded)
 
     def search(
         self,
         query_embedding: np.ndarray,
-    ) -> List[Dict[str, Any]]:
+    ) -> pd.DataFrame:
         if query_embedding.ndim == 1:
             query_embedding = query_embedding.reshape(1, -1).astype(np.float32)
         elif query_embedding.ndim == 2:
@@ -57,16 +78,30 @@ class FaissIndex:
         else:
             raise ValueError("query_embedding must be 1D or 2D array")
 
+        candidates = self.search_batch(query_embeddings=query_embedding)[0]
+        return candidates
+
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+    ) -> List[pd.DataFrame]:
+        if query_embeddings.ndim != 2:
+            raise ValueError("query_embeddings must be 2D array")
+        query_embeddings = query_embeddings.astype(np.float32)
+
         distances, indices = self.index.search(
-            query_embedding,
+            query_embeddings,
             k=self.retrieval_top_k,
         )
 
         candidates = []
-        for idx, distance in zip(indices[0], distances[0]):
-            row = self.df.iloc[idx].to_dict()
-            row[self.distance_column_name] = float(distance)
-            candidates.append(row)
+        for row_indices, row_distances in zip(indices, distances):
+            is_valid = row_indices >= 0
+            row_candidates = self.df.iloc[row_indices[is_valid]].reset_index(
+                drop=True
+            )
+            row_candidates[self.distance_column_name] = row_distances[is_valid]
+            candidates.append(row_candidates)
         return candidates
 
     def save(self) -> None:
@@ -79,7 +114,7 @@ class FaissIndex:
             self.index,
             self.indices_path,
         )
-        self.df.to_csv(
+        self.df.to_parquet(
             self.items_path,
             index=False,
         )
@@ -91,4 +126,34 @@ class FaissIndex:
             raise FileNotFoundError(f"Missing items: {self.items_path}")
 
         index = faiss.read_index(self.indices_path)
+        if isinstance(index, faiss.IndexHNSW):
+            index.hnsw.efSearch = self.ef_search
         self.index = index
+
+    def to_gpu(
+        self,
+        device_id: int,
+    ) -> None:
+        if isinstance(self.index, faiss.IndexHNSW):
+            print(
+                "Warning: GPU FAISS has no HNSW/SQ index, searching with exact flat index instead. "
+                "Results are not comparable to CPU HNSW runs."
+            )
+            storage = faiss.downcast_index(self.index.storage)
+            if isinstance(storage, faiss.IndexFlat):
+                index = storage
+            else:
+                index = faiss.IndexFlat(
+                    self.dim,
+                    storage.metric_type,
+                )
+                index.add(storage.reconstruct_n(0, storage.ntotal))
+        else:
+            index = self.index
+
+        self.gpu_resources = faiss.StandardGpuResources()
+        self.index = faiss.index_cpu_to_gpu(
+            self.gpu_resources,
+            device_id,
+            index,
+        )
@@ -1,5 +1,8 @@
 from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+import threading
 
+import numpy as np
 import pandas as pd
 
 from ..models import VllmEmbedding, VllmReranker
@@ -14,6 +17,7 @@ class RecommendationManager:
         index: FaissIndex,
         score_column_name: str,
         rerank_top_k: int,
+        embedding_cache_size: int,
     ) -> None:
         self.embedding = embedding
         self.reranker = reranker
@@ -24,36 +28,81 @@ class RecommendationManager:
         self.score_column_name = score_column_name
         self.rerank_top_k = rerank_top_k
 
+        self.embedding_cache_size = embedding_cache_size
+        self._embedding_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        self._embedding_cache_hit = 0
+        self._embedding_cache_miss = 0
+
     def retrieve(
         self,
         query: str,
-    ) -> List[Dict[str, Any]]:
-        query_embedding = self.embedding(query=query)
+    ) -> pd.DataFrame:
+        query_embedding = self.embed_many_cached(queries=[query])[0]
         candidates = self.index.search(query_embedding=query_embedding)
         return candidates
 
+    def retrieve_batch(
+        self,
+        queries: List[str],
+    ) -> List[pd.DataFrame]:
+        if not queries:
+            return []
+
+        query_embeddings = self.embed_many_cached(queries=queries)
+        candidates = self.index.search_batch(query_embeddings=query_embeddings)
+        return candidates
+
+    def embed_many_cached(
+        self,
+        queries: List[str],
+    ) -> np.ndarray:
+        cached_embeddings = {}
+        with self._embedding_cache_lock:
+            for query in queries:
+                if query in self._embedding_cache:
+                    self._embedding_cache.move_to_end(query)
+                    cached_embeddings[query] = self._embedding_cache[query]
+        num_hits = sum(query in cached_embeddings for query in queries)
+
+        missed_queries = list(
+            dict.fromkeys(query for query in queries if query not in cached_embeddings)
+        )
+        missed_embeddings = []
+        if missed_queries:
+            missed_embeddings = self.embedding.embed_many(queries=missed_queries)
+
+        with self._embedding_cache_lock:
+            self._embedding_cache_hit += num_hits
+            self._embedding_cache_miss += len(queries) - num_hits
+            for query, query_embedding in zip(missed_queries, missed_embeddings):
+                cached_embeddings[query] = query_embedding
+                self._embedding_cache[query] = query_embedding.copy()
+            while len(self._embedding_cache) > self.embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+
+        query_embeddings = np.stack([cached_embeddings[query] for query in queries])
+        return query_embeddings
+
     def rerank(
         self,
         query: str,
-        candidates: List[Dict[str, Any]],
+        candidates: pd.DataFrame,
     ) -> Optional[List[Dict[str, Any]]]:
-        if not candidates:
+        if candidates.empty:
             return None
 
-        target_candidates = [candidate["chunk"] for candidate in candidates]
+        target_candidates = candidates["chunk"].tolist()
         scores = self.reranker(
             query=query,
             candidates=target_candidates,
         )
 
-        for candidate, score in zip(candidates, scores):
-            candidate[self.score_column_name] = float(score)
-
-        candidates.sort(
-            key=lambda x: x[self.score_column_name],
-            reverse=True,
-        )
-        reranked_candidates = candidates[: self.rerank_top_k]
+        candidates = candidates.assign(**{self.score_column_name: scores})
+        reranked_candidates = candidates.nlargest(
+            self.rerank_top_k,
+            self.score_column_name,
+        ).to_dict(orient="records")
         return reranked_candidates
 
     def retrieve_and_rerank(
@@ -63,13 +112,6 @@ class RecommendationManager:
         query = input_value
 
         candidates = self.retrieve(query=query)
-        if candidates is None:
-            reranked_result = {
-                "reranked_candidates": None,
-                "query": query,
-            }
-            return reranked_result
-
         reranked_candidates = self.rerank(
             query=query,
             candidates=candidates,
@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import List, Optional
 import os
 
 import numpy as np
 
+from tqdm import tqdm
+
 from vllm import LLM
 
 
@@ -73,6 +75,35 @@ class VllmEmbedding:
         )
         return embedding
 
+    def embed_many(
+        self,
+        queries: List[str],
+        batch_size: int = 256,
+    ) -> np.ndarray:
+        if not queries:
+            raise ValueError("queries must not be empty")
+
+        embeddings = None
+        for i in tqdm(
+            range(0, len(queries), batch_size), desc="Generating embeddings"
+        ):
+            input_texts = [
+                self.get_detailed_instruction(query=query)
+                for query in queries[i : i + batch_size]
+            ]
+            outputs = self.llm.embed(
+                input_texts,
+                use_tqdm=False,
+            )
+            if embeddings is None:
+                embeddings = np.empty(
+                    (len(queries), len(outputs[0].outputs.embedding)),
+                    dtype=np.float32,
+                )
+            for j, output in enumerate(outputs):
+                embeddings[i + j] = output.outputs.embedding
+        return embeddings
+
     def get_detailed_instruction(
         self,
         query: str,
@@ -1,7 +1,7 @@
 from typing import Dict, List, Tuple, Optional
 import os
 
-import math
+import numpy as np
 
 from transformers import AutoTokenizer
 
@@ -92,7 +92,7 @@ class VllmReranker:
         self,
         query: str,
         candidates: List[str],
-    ) -> List[float]:
+    ) -> np.ndarray:
         scores = self.get_scores(
             query=query,
             candidates=candidates,
@@ -103,7 +103,7 @@ class VllmReranker:
         self,
         query: str,
         candidates: List[str],
-    ) -> List[float]:
+    ) -> np.ndarray:
         pairs = list(zip([query] * len(candidates), candidates))
         messages = self.process_inputs(pairs=pairs)
         outputs = self.llm.generate(
@@ -111,21 +111,25 @@ class VllmReranker:
             self.sampling_params,
             use_tqdm=False,
         )
-        scores = []
-        for i in range(len(outputs)):
-            final_logits = outputs[i].outputs[0].logprobs[-1]
-            if self.true_token not in final_logits:
-                true_logit = -10
-            else:
-                true_logit = final_logits[self.true_token].logprob
-            if self.false_token not in final_logits:
-                false_logit = -10
-            else:
-                false_logit = final_logits[self.false_token].logprob
-            true_score = math.exp(true_logit)
-            false_score = math.exp(false_logit)
-            score = true_score / (true_score + false_score)
-            scores.append(score)
+        true_logits = np.full(
+            len(outputs),
+            -10,
+            dtype=np.float32,
+        )
+        false_logits = np.full(
+            len(outputs),
+            -10,
+            dtype=np.float32,
+        )
+        for i, output in enumerate(outputs):
+            final_logits = output.outputs[0].logprobs[-1]
+            if self.true_token in final_logits:
+                true_logits[i] = final_logits[self.true_token].logprob
+            if self.false_token in final_logits:
+                false_logits[i] = final_logits[self.false_token].logprob
+        true_scores = np.exp(true_logits)
+        false_scores = np.exp(false_logits)
+        scores = true_scores / (true_scores + false_scores)
         return scores
 
     def format_instruction(
@@ -4,6 +4,8 @@ import pandas as pd
 
 from tqdm import tqdm
 
+import faiss
+
 from omegaconf import DictConfig
 
 from ..utils import SetUp
@@ -12,23 +14,34 @@ from ..utils import SetUp
 def pipeline(
     config: DictConfig,
 ) -> None:
+    if config.faiss_num_threads is not None:
+        faiss.omp_set_num_threads(config.faiss_num_threads)
+
     setup = SetUp(config)
 
     recommendation_manager = setup.get_manager(manager_type="recommendation")
     report_manager = setup.get_manager(manager_type="report")
+    if config.device_id.index is not None:
+        recommendation_manager.index.to_gpu(device_id=config.device_id.index)
 
     eval_data_path = os.path.join(
         config.data_path,
         config.eval_file_name,
     )
-    eval_df = pd.read_csv(eval_data_path)
+    eval_df = pd.read_parquet(eval_data_path)
 
-    results = []
-    for _, row in tqdm(eval_df.iterrows(), total=eval_df.shape[0]):
-        question = row["question"]
+    questions = eval_df["question"].tolist()
+    retrieved_candidates = recommendation_manager.retrieve_batch(
+        queries=questions,
+    )
 
-        reranked_candidates = recommendation_manager.recommend(
-            input_value=question,
+    results = []
+    for question, candidates in tqdm(
+        zip(questions, retrieved_candidates), total=len(questions)
+    ):
+        reranked_candidates = recommendation_manager.rerank(
+            query=question,
+            candidates=candidates,
         )
 
         if reranked_candidates:
@@ -55,7 +68,7 @@ def pipeline(
         config.data_path,
         config.result_file_name,
     )
-    results_df.to_csv(
+    results_df.to_parquet(
         result_path,
         index=False,
     )